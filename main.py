@@ -1,16 +1,28 @@
-# 1. 라이브러리 설치 (Google Colab 환경에서 필요시 실행)
-# 이 셀들을 가장 먼저 실행해주세요. (세션당 한 번 또는 런타임 재시작 시)
-!pip install tabula-py pandas fpdf2 PyMuPDF
-
-# 2. 한글 폰트 설치 (Google Colab 환경에서 필요시 실행)
-!apt-get install -y fonts-nanum*
-import matplotlib.font_manager as fm
-try:
- fm._rebuild()
-except AttributeError:
- pass
+# 1. 라이브러리 설치 (Google Colab 환경에서만 실행)
+# Colab 셀에서 실행하면 세션당 한 번 라이브러리와 한글 폰트를 설치합니다.
+# 로컬에서는 'pip install tabula-py pandas fpdf2 PyMuPDF jpype1'로 미리 설치해 두면
+# 일반 파이썬 스크립트로 실행/임포트할 수 있습니다.
+# (jpype1이 있어야 tabula가 JVM을 프로세스 안에 띄워 재사용합니다. 없으면 호출마다 java를 새로 실행)
+import sys  # Colab 확인, resource_path 함수 및 OS 확인용
+if 'google.colab' in sys.modules:
+    from IPython import get_ipython
+    get_ipython().system("pip install tabula-py pandas fpdf2 PyMuPDF jpype1")
+
+    # 2. 한글 폰트 설치
+    get_ipython().system("apt-get install -y fonts-nanum*")
+    import matplotlib.font_manager as fm
+    try:
+        fm._rebuild()
+    except AttributeError:
+        pass
 
 # 파일 경로: main.py
+#
+# 실행 방법 (로컬):
+#   python main.py                     Tkinter UI
+#   python main.py serve [--port 8000]  급여대장 PDF를 받아 명세서 ZIP을 돌려주는 로컬 HTTP 서비스
+#   python main.py watch <폴더>         폴더에 들어오는 급여대장을 자동으로 처리
+#   (각 모드의 옵션은 'python main.py serve --help'로 확인)
 
 # 1. 필요한 라이브러리 임포트
 import tabula
@@ -22,8 +34,28 @@ import fitz  # PyMuPDF (지급일 추출용)
 import tkinter as tk
 from tkinter import filedialog, messagebox
 import os
-import sys  # resource_path 함수 및 OS 확인용
 import logging  # 로깅 추가
+import csv  # 수신자 목록 / 발송 결과 보고서
+import io
+import shutil  # 감시 모드 결과 폴더 교체
+import stat
+import tempfile
+import zipfile  # HTTP 서비스 응답용 ZIP
+import argparse  # 서비스 모드 실행 옵션
+import queue
+import smtplib  # 급여명세서 이메일 발송
+import ssl
+import threading
+import time
+import multiprocessing  # 명세서 생성 프로세스 풀
+import importlib.util  # jpype 설치 여부 확인
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from email.message import EmailMessage
+from email.parser import BytesParser
+from email import policy as email_policy
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 # 2. 로거(Logger) 설정
 logger = logging.getLogger(__name__)
@@ -57,15 +89,14 @@ def clean_value(value):
     return value
 
 
-def verify_employee_totals(record):
+def find_employee_total_errors(record):
     """
-    '직원' 구분의 레코드에 대해 지급합계, 공제합계, 차인지급액이 올바른지 검증.
-    화면(UI)과 콘솔에 경고를 로깅합니다.
+    '직원' 구분의 레코드에 대해 지급합계, 공제합계, 차인지급액이 올바른지 검증하여
+    불일치 메시지 리스트를 반환 (로깅하지 않음). 문제가 없으면 빈 리스트.
     """
     if record.get('구분') != '직원':
-        return
+        return []
 
-    emp_name = record.get('성명', 'N/A')
     error_messages = []
 
     # 지급 항목 합계 계산
@@ -105,6 +136,17 @@ def verify_employee_totals(record):
             f"    - 차인지급액 불일치: 계산된 값({calculated_net_pay:,}) != 추출된 값({expected_net_pay:,})"
         )
 
+    return error_messages
+
+
+def verify_employee_totals(record):
+    """
+    '직원' 구분의 레코드에 대해 지급합계, 공제합계, 차인지급액이 올바른지 검증.
+    화면(UI)과 콘솔에 경고를 로깅합니다.
+    """
+    emp_name = record.get('성명', 'N/A')
+    error_messages = find_employee_total_errors(record)
+
     # 오류가 하나라도 있으면 로거에 warning으로 출력
     if error_messages:
         logger.warning(f"{emp_name}님 데이터 검증 오류:")
@@ -189,8 +231,11 @@ def extract_and_process_payroll_with_tabula(pdf_path):
     """
     tabula-py를 이용해 첫 페이지에서 직원별 급여 데이터 테이블을 읽어와서
     parse_payroll_data_from_raw_table()를 통해 정제한 후 딕셔너리 리스트 반환.
+    pdf_path 대신 PDF 내용(bytes)을 넘기면 메모리에서 바로 읽습니다.
     """
     try:
+        if isinstance(pdf_path, (bytes, bytearray)):
+            pdf_path = io.BytesIO(pdf_path)
         tables = tabula.read_pdf(
             pdf_path,
             pages='1',
@@ -220,23 +265,33 @@ def extract_and_process_payroll_with_tabula(pdf_path):
         return None
 
 
+# PyMuPDF는 멀티스레드 사용을 지원하지 않으므로(동시 호출 시 인터프리터가 죽을 수 있음)
+# 서비스/감시 모드에서 모든 fitz 호출을 이 잠금으로 직렬화합니다.
+_fitz_lock = threading.Lock()
+
+
 def extract_payment_date(pdf_path):
     """
     PyMuPDF(fitz)를 이용해 PDF 첫 페이지 텍스트에서 '지급: YYYY년M월D일' 형식으로
     매칭되는 문자열을 찾아 반환. 없으면 '지급일 정보 없음' 반환.
+    pdf_path 대신 PDF 내용(bytes)을 넘기면 메모리에서 바로 읽습니다.
     """
     try:
-        doc = fitz.open(pdf_path)
-        page = doc[0]
-        text = page.get_text("text")
+        with _fitz_lock:
+            if isinstance(pdf_path, (bytes, bytearray)):
+                doc = fitz.open(stream=bytes(pdf_path), filetype="pdf")
+            else:
+                doc = fitz.open(pdf_path)
+            try:
+                text = doc[0].get_text("text")
+            finally:
+                doc.close()
         match = re.search(r"\[지급\s*:\s*(\d{4}년\s?\d{1,2}월\s?\d{1,2}일)\]", text)
         if match:
             payment_date_raw = match.group(1).replace(" ", "")
             logger.info(f"추출된 지급일: {payment_date_raw}")
-            doc.close()
             return payment_date_raw
 
-        doc.close()
         logger.warning("지급일을 찾지 못했습니다.")
         return "지급일 정보 없음"
 
@@ -259,6 +314,26 @@ def resource_path(relative_path):
     return os.path.join(base_path, relative_path)
 
 
+_font_file_cache = {}
+
+
+def find_font_file(font_name='NanumGothic.ttf'):
+    """
+    폰트 파일 경로를 찾아 반환 (없으면 None). 한 번 찾은 경로는 캐시하여
+    명세서마다 파일 시스템을 다시 뒤지지 않습니다. (폰트 자체는 fpdf2가 문서마다 다시 읽음)
+    """
+    if font_name not in _font_file_cache:
+        font_file = resource_path(font_name)
+        if not os.path.exists(font_file):
+            # Colab 환경에서 '/content/'에 업로드된 경우를 대비
+            if 'google.colab' in sys.modules and os.path.exists(font_name):
+                font_file = font_name
+            else:
+                font_file = None
+        _font_file_cache[font_name] = font_file
+    return _font_file_cache[font_name]
+
+
 class PayStubPDF(FPDF):
     """
     PayStubPDF: 직원별 급여명세서를 생성하는 클래스.
@@ -268,20 +343,16 @@ class PayStubPDF(FPDF):
         super().__init__(*args, **kwargs)
 
         # 'NanumGothic.ttf' 파일을 패키지/현재 폴더에서 로드
-        font_file_to_load = resource_path('NanumGothic.ttf')
+        font_file_to_load = find_font_file('NanumGothic.ttf')
         try:
-            if not os.path.exists(font_file_to_load):
-                # Colab 환경에서 '/content/'에 업로드된 경우를 대비
-                if 'google.colab' in sys.modules and os.path.exists('NanumGothic.ttf'):
-                    font_file_to_load = 'NanumGothic.ttf'
-                else:
-                    raise RuntimeError(f"폰트 파일을 찾을 수 없습니다: {font_file_to_load}")
+            if font_file_to_load is None:
+                raise RuntimeError(f"폰트 파일을 찾을 수 없습니다: {resource_path('NanumGothic.ttf')}")
 
             self.add_font('NanumGothic', '', font_file_to_load)
             self.add_font('NanumGothic', 'B', font_file_to_load)  # 굵은 스타일도 동일 파일로 등록
             self.font_family_regular = 'NanumGothic'
             self.font_family_bold = 'NanumGothic'
-            logger.info(f"폰트 '{font_file_to_load}' 로드 완료.")
+            logger.debug(f"폰트 '{font_file_to_load}' 로드 완료.")
         except RuntimeError as e:
             logger.error(f"FPDF 폰트 설정 오류: {e}. 'NanumGothic.ttf' 파일을 올바른 위치에 두었는지 확인해주세요.")
             self.font_family_regular = 'Arial'  # 기본 폰트로 대체
@@ -448,27 +519,853 @@ class PayStubPDF(FPDF):
 
         self.ln(10)
 
+    def build_paystub(self, employee_data, payment_date):
+        self.add_page()
+        self.chapter_title("임  금  명  세  서")
+        self.employee_details(employee_data, payment_date)
+        self.payment_details_table(employee_data)
+        self.work_days_hours()
+        self.calculation_methods()
+
     def generate_paystub_pdf(self, employee_data, payment_date, filename="급여명세서.pdf"):
         try:
-            self.add_page()
-            self.chapter_title("임  금  명  세  서")
-            self.employee_details(employee_data, payment_date)
-            self.payment_details_table(employee_data)
-            self.work_days_hours()
-            self.calculation_methods()
+            self.build_paystub(employee_data, payment_date)
             self.output(filename, 'F')
             logger.info(f"'{filename}' 파일이 생성되었습니다.")
         except Exception as e:
             logger.exception(f"PayStubPDF 생성 중 오류 발생: {e}")
 
 
-# 5. Tkinter UI 클래스 및 실행 코드
+def paystub_filename(employee_record):
+    """직원 레코드로 '{성명}_{사원번호}_급여명세서.pdf' 파일명을 만듭니다."""
+    emp_name = str(employee_record.get('성명', '정보없음')).replace(" ", "_")
+    emp_id = str(employee_record.get('사원번호', 'ID없음'))
+    return f"{emp_name}_{emp_id}_급여명세서.pdf"
+
+
+def render_paystub(employee_record, payment_date):
+    """직원 한 명의 급여명세서를 파일로 저장하지 않고 PDF bytes로 반환."""
+    pdf = PayStubPDF()
+    pdf.build_paystub(employee_record, payment_date)
+    return bytes(pdf.output())
+
+
+def init_render_worker():
+    """
+    명세서 생성 프로세스 초기화: 샘플 명세서를 한 장 만들어 FPDF/fontTools 모듈과 폰트 경로를 미리 로드.
+    예열에 실패해도(폰트 없음 등) 프로세스는 살려 두고, 실제 생성 시의 오류로 보고되게 합니다.
+    (initializer에서 예외가 나면 풀 전체가 BrokenProcessPool이 됨)
+    """
+    try:
+        render_paystub({'구분': '직원', '성명': '예열', '사원번호': 0}, "지급일 정보 없음")
+    except Exception as e:
+        logger.warning(f"명세서 생성 프로세스 예열 실패: {e}")
+
+
+def render_paystub_task(employee_record, payment_date):
+    """
+    프로세스 풀에서 실행하는 render_paystub.
+    fpdf2의 일부 예외(FPDFUnicodeEncodingException 등)는 부모 프로세스에서 unpickle되지 않아
+    풀 전체가 BrokenProcessPool이 되므로, 메시지를 담은 RuntimeError로 바꿔 전달합니다.
+    """
+    try:
+        return render_paystub(employee_record, payment_date)
+    except Exception as e:
+        raise RuntimeError(
+            f"{employee_record.get('성명', 'N/A')}님 명세서 생성 실패: {type(e).__name__}: {e}"
+        ) from None
+
+
+def _worker_pid(_):
+    return os.getpid()
+
+
+class RenderPool:
+    """
+    직원별 명세서를 생성하는 프로세스 풀.
+    - FPDF 렌더링은 순수 파이썬 CPU 작업이라 스레드로는 GIL 때문에 병렬화되지 않으므로 프로세스를 사용
+    - spawn 방식: 스레드와 JVM(tabula)이 떠 있는 서비스 프로세스를 fork하지 않도록
+    - fpdf2는 문서마다 폰트 파일을 다시 파싱하므로, 생성 속도는 프로세스 수만큼 병렬로 올라갑니다
+    - 작업 프로세스가 죽어(메모리 부족 등) 풀이 깨지면 새 풀을 만들어 한 번 다시 시도
+    """
+    def __init__(self, workers):
+        self.workers = workers
+        self._lock = threading.Lock()
+        self._executor = self._create_executor()
+
+    def _create_executor(self):
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=init_render_worker
+        )
+
+    def _replace_broken(self, broken_executor):
+        with self._lock:
+            if self._executor is broken_executor:
+                logger.warning("명세서 생성 프로세스가 비정상 종료되어 프로세스 풀을 다시 만듭니다.")
+                self._executor = self._create_executor()
+                broken_executor.shutdown(wait=False)
+            return self._executor
+
+    def map(self, fn, *iterables):
+        """executor.map과 같되 결과를 리스트로 반환."""
+        iterables = [list(items) for items in iterables]
+        executor = self._executor
+        try:
+            return list(executor.map(fn, *iterables))
+        except BrokenProcessPool:
+            executor = self._replace_broken(executor)
+            return list(executor.map(fn, *iterables))
+
+    def start_workers(self):
+        """작업 프로세스를 workers개 미리 띄움 (각 프로세스에서 init_render_worker 실행)."""
+        self.map(_worker_pid, range(self.workers))
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
+
+
+def make_render_pool(workers):
+    """직원별 명세서 생성용 RenderPool을 만듭니다."""
+    return RenderPool(workers)
+
+
+def build_validation_report(payroll_data_list, payment_date):
+    """추출된 레코드의 합계 검증 결과를 사람이 읽을 수 있는 텍스트로 반환."""
+    employees = [r for r in payroll_data_list if r.get('구분') == '직원']
+    lines = [
+        "급여대장 검증 결과",
+        f"지급일: {payment_date}",
+        f"직원 수: {len(employees)}명",
+        "",
+    ]
+    num_errors = 0
+    for record in employees:
+        error_messages = find_employee_total_errors(record)
+        if error_messages:
+            num_errors += 1
+            lines.append(f"{record.get('성명', 'N/A')}({record.get('사원번호', 'ID없음')})님 데이터 검증 오류:")
+            lines.extend(error_messages)
+    if num_errors == 0:
+        lines.append("모든 직원의 지급합계 / 공제합계 / 차인지급액이 일치합니다.")
+    else:
+        lines.append("")
+        lines.append(f"검증 오류가 있는 직원: {num_errors}명")
+    return "\n".join(lines) + "\n"
+
+
+def process_ledger(pdf_source, executor=None):
+    """
+    급여대장 PDF(경로 또는 bytes) 하나를 처리하여 메모리에서 결과를 반환.
+    - 반환: {'payment_date', 'paystubs': [(파일명, PDF bytes), ...], 'report': 검증 결과 텍스트}
+    - executor(make_render_pool로 만든 프로세스 풀)를 넘기면 직원별 명세서를 병렬로 생성
+    - 급여 데이터 추출에 실패하면 None
+    """
+    payroll_data_list = extract_and_process_payroll_with_tabula(pdf_source)
+    if not payroll_data_list:
+        return None
+    payment_date = extract_payment_date(pdf_source)
+
+    employees = [r for r in payroll_data_list if r.get('구분') == '직원']
+    if executor is not None:
+        pdfs = list(executor.map(render_paystub_task, employees, [payment_date] * len(employees)))
+    else:
+        pdfs = [render_paystub(r, payment_date) for r in employees]
+
+    return {
+        'payment_date': payment_date,
+        'paystubs': [(paystub_filename(r), data) for r, data in zip(employees, pdfs)],
+        'report': build_validation_report(payroll_data_list, payment_date),
+    }
+
+
+# 5. 급여명세서 이메일 일괄 발송 (SMTP 연결 풀 + 스레드 풀)
+PAYSTUB_SUFFIX = "_급여명세서.pdf"
+
+
+def parse_paystub_filename(path):
+    """
+    '{성명}_{사원번호}_급여명세서.pdf' 형식의 파일명에서 (성명, 사원번호)를 반환.
+    성명에 '_'가 포함될 수 있으므로 오른쪽 기준으로 분리합니다. 형식이 다르면 (None, None).
+    """
+    basename = os.path.basename(path)
+    if not basename.endswith(PAYSTUB_SUFFIX):
+        return None, None
+    stem = basename[:-len(PAYSTUB_SUFFIX)]
+    if '_' not in stem:
+        return None, None
+    emp_name, emp_id = stem.rsplit('_', 1)
+    return emp_name.replace("_", " "), emp_id
+
+
+def load_recipients(csv_path):
+    """
+    '사원번호', '이메일' 열을 가진 CSV 파일에서 {사원번호: 이메일} 딕셔너리 반환.
+    엑셀에서 저장한 UTF-8(BOM) 파일도 읽을 수 있도록 utf-8-sig로 엽니다.
+    """
+    recipients = {}
+    with open(csv_path, newline='', encoding='utf-8-sig') as f:
+        for row in csv.DictReader(f):
+            emp_id = str(clean_value(row.get('사원번호')) or '').strip()
+            email = (row.get('이메일') or '').strip()
+            if emp_id and email:
+                recipients[emp_id] = email
+    logger.info(f"수신자 목록에서 {len(recipients)}명의 이메일 주소를 읽었습니다.")
+    return recipients
+
+
+def smtp_settings_from_env():
+    """
+    환경 변수에서 SMTP 설정을 읽어 딕셔너리로 반환. PAYROLL_SMTP_HOST가 없으면 None.
+    - PAYROLL_SMTP_HOST / PAYROLL_SMTP_PORT (기본 587) / PAYROLL_SMTP_TLS (기본 1)
+    - PAYROLL_SMTP_USER / PAYROLL_SMTP_PASSWORD / PAYROLL_SMTP_SENDER
+    - PAYROLL_SMTP_POOL_SIZE (기본 3) / PAYROLL_SMTP_RATE (초당 발송 수, 기본 5)
+    """
+    host = os.environ.get('PAYROLL_SMTP_HOST')
+    if not host:
+        return None
+    username = os.environ.get('PAYROLL_SMTP_USER') or None
+    return {
+        'host': host,
+        'port': int(os.environ.get('PAYROLL_SMTP_PORT', '587')),
+        'use_tls': os.environ.get('PAYROLL_SMTP_TLS', '1') not in ('0', 'false', 'False', 'no'),
+        'username': username,
+        'password': os.environ.get('PAYROLL_SMTP_PASSWORD') or None,
+        'sender': os.environ.get('PAYROLL_SMTP_SENDER') or username,
+        'pool_size': int(os.environ.get('PAYROLL_SMTP_POOL_SIZE', '3')),
+        'rate_per_sec': float(os.environ.get('PAYROLL_SMTP_RATE', '5')),
+    }
+
+
+class SMTPConnectionPool:
+    """
+    SMTP 연결 풀:
+    - 최대 size개의 연결을 열어 두고 메시지마다 재사용 (메시지당 연결을 새로 열지 않음)
+    - 서버가 끊었거나 소켓 오류가 난 연결은 버리고, 다음 요청 시 새로 연결
+    """
+    def __init__(self, host, port=587, username=None, password=None, use_tls=True, size=3, timeout=30):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.size = size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+
+    def _connect(self):
+        conn = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.use_tls:
+                conn.starttls(context=ssl.create_default_context())
+            if self.username:
+                conn.login(self.username, self.password)
+        except BaseException:
+            # TLS/인증 실패 시 열어 둔 소켓을 바로 닫음
+            conn.close()
+            raise
+        logger.debug(f"SMTP 연결 생성: {self.host}:{self.port}")
+        return conn
+
+    @staticmethod
+    def _discard(conn):
+        try:
+            conn.quit()
+        except (smtplib.SMTPException, OSError):
+            conn.close()
+
+    @contextmanager
+    def connection(self):
+        """
+        풀에서 연결 하나를 빌려 줍니다. 동시에 빌릴 수 있는 연결은 최대 size개.
+        블록 안에서 연결이 끊어지는 오류가 나면 그 연결은 풀에 돌려놓지 않습니다.
+        """
+        self._slots.acquire()
+        conn = None
+        try:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = self._connect()
+            yield conn
+        except OSError as e:
+            # 서버가 응답한 오류(수신자 거부 등)는 세션이 살아 있으므로 연결을 계속 사용
+            server_replied = isinstance(e, (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused))
+            if conn is not None and not (server_replied and conn.sock is not None):
+                self._discard(conn)
+                conn = None
+            raise
+        finally:
+            if conn is not None:
+                self._idle.put(conn)
+            self._slots.release()
+
+    def close(self):
+        """풀에 남아 있는 모든 연결을 종료."""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+
+
+class RateLimiter:
+    """
+    초당 최대 rate_per_sec건으로 발송 속도를 제한 (여러 스레드에서 공유 가능).
+    rate_per_sec가 0 이하이면 제한하지 않습니다.
+    """
+    def __init__(self, rate_per_sec):
+        self.interval = 1.0 / rate_per_sec if rate_per_sec and rate_per_sec > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def build_paystub_message(pdf_path, sender, recipient, emp_name, subject, body):
+    """급여명세서 PDF를 첨부한 EmailMessage 생성."""
+    msg = EmailMessage()
+    msg['From'] = sender
+    msg['To'] = recipient
+    msg['Subject'] = subject
+    msg.set_content(body.format(name=emp_name))
+    with open(pdf_path, 'rb') as f:
+        msg.add_attachment(f.read(), maintype='application', subtype='pdf',
+                           filename=os.path.basename(pdf_path))
+    return msg
+
+
+def _is_permanent_smtp_error(error):
+    """
+    재시도해도 소용없는 오류(5xx 응답)인지 판별.
+    수신자 거부는 모든 수신자의 응답 코드가 5xx일 때만 영구 오류로 봅니다.
+    (450/451 등 4xx는 그레이리스팅, 속도 제한 같은 일시적 거부이므로 재시도)
+    """
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        codes = [code for code, _ in error.recipients.values()]
+        return bool(codes) and all(500 <= code < 600 for code in codes)
+    code = getattr(error, 'smtp_code', None)
+    return isinstance(code, int) and 500 <= code < 600
+
+
+def distribute_paystubs(paystub_files, recipients, pool, sender,
+                        subject="급여명세서 송부",
+                        body="{name}님, 이번 달 급여명세서를 첨부하여 보내드립니다.",
+                        max_workers=None, rate_per_sec=5, max_retries=3, backoff_base=1.0):
+    """
+    생성된 급여명세서 PDF들을 스레드 풀에서 병렬로 이메일 발송.
+    - 연결은 pool(SMTPConnectionPool)에서 재사용, 발송 속도는 rate_per_sec로 제한
+    - 일시적 오류는 backoff_base × 2^(시도-1)초 대기 후 최대 max_retries회까지 시도
+    - 반환: 파일별 발송 결과 딕셔너리 리스트 (write_delivery_report로 저장 가능)
+    - SMTP 인증에 실패하면 나머지 발송을 멈추고 smtplib.SMTPAuthenticationError를 그대로 발생
+    """
+    limiter = RateLimiter(rate_per_sec)
+    auth_failed = threading.Event()
+
+    def send_one(pdf_path):
+        if auth_failed.is_set():
+            return None
+        emp_name, emp_id = parse_paystub_filename(pdf_path)
+        result = {
+            '파일': os.path.basename(pdf_path),
+            '성명': emp_name or '',
+            '사원번호': emp_id or '',
+            '이메일': recipients.get(emp_id, '') if emp_id else '',
+            '상태': '',
+            '시도횟수': 0,
+            '오류': '',
+        }
+        if not result['이메일']:
+            result['상태'] = '수신자 없음'
+            logger.warning(f"'{result['파일']}': 수신자 목록에 이메일 주소가 없어 건너뜁니다.")
+            return result
+
+        try:
+            msg = build_paystub_message(pdf_path, sender, result['이메일'], emp_name, subject, body)
+        except OSError as e:
+            result['상태'] = '실패'
+            result['오류'] = str(e)
+            logger.error(f"'{result['파일']}' 첨부 파일을 읽지 못했습니다: {e}")
+            return result
+
+        for attempt in range(1, max_retries + 1):
+            if auth_failed.is_set():
+                return None
+            result['시도횟수'] = attempt
+            limiter.wait()
+            try:
+                with pool.connection() as conn:
+                    conn.send_message(msg)
+                result['상태'] = '성공'
+                result['오류'] = ''
+                logger.info(f"'{result['파일']}' → {result['이메일']} 발송 완료.")
+                return result
+            except smtplib.SMTPAuthenticationError as e:
+                # 계정 문제는 파일마다 반복되므로 전체 발송을 중단
+                if not auth_failed.is_set():
+                    auth_failed.set()
+                    logger.error(f"SMTP 인증 실패로 이메일 발송을 중단합니다: {e}")
+                raise
+            except OSError as e:  # smtplib.SMTPException 포함
+                result['오류'] = str(e)
+                if _is_permanent_smtp_error(e) or attempt == max_retries:
+                    break
+                delay = backoff_base * (2 ** (attempt - 1))
+                logger.warning(f"'{result['파일']}' 발송 실패({attempt}회차): {e}. {delay:.1f}초 후 재시도합니다.")
+                time.sleep(delay)
+
+        result['상태'] = '실패'
+        logger.error(f"'{result['파일']}' → {result['이메일']} 발송 실패: {result['오류']}")
+        return result
+
+    with ThreadPoolExecutor(max_workers=max_workers or pool.size) as executor:
+        results = list(executor.map(send_one, paystub_files))
+
+    num_sent = sum(1 for r in results if r['상태'] == '성공')
+    logger.info(f"이메일 발송 완료: 총 {len(results)}건 중 {num_sent}건 성공, {len(results) - num_sent}건 미발송.")
+    return results
+
+
+def write_delivery_report(results, report_path):
+    """발송 결과를 CSV 보고서로 저장 (엑셀에서 열 수 있도록 utf-8-sig)."""
+    fieldnames = ['파일', '성명', '사원번호', '이메일', '상태', '시도횟수', '오류']
+    with open(report_path, 'w', newline='', encoding='utf-8-sig') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(results)
+    logger.info(f"발송 결과 보고서 '{report_path}' 저장 완료.")
+
+
+# 6. 로컬 HTTP 서비스 모드 (급여대장 업로드 → 급여명세서 ZIP 응답)
+MAX_UPLOAD_BYTES = 50 * 1024 * 1024  # 업로드 최대 크기 (50MB)
+VALIDATION_REPORT_NAME = "검증결과.txt"
+
+
+def make_console_handler():
+    """UI 없이 실행하는 모드(서비스 등)에서 로그를 콘솔로 출력하는 핸들러."""
+    handler = logging.StreamHandler()
+    handler.setFormatter(
+        logging.Formatter('%(asctime)s - %(levelname)s - %(message)s', datefmt='%Y-%m-%d %H:%M:%S')
+    )
+    return handler
+
+
+def warm_up_backends(render_pool=None):
+    """
+    요청을 받기 전에 한 번 실행:
+    - render_pool이 있으면 작업 프로세스를 미리 띄움 (RenderPool.start_workers)
+    - 샘플 PDF를 tabula와 PyMuPDF로 읽어 Java(JVM) 등 추출 백엔드를 미리 기동
+      (jpype1이 설치되어 있어야 JVM이 프로세스에 계속 유지됩니다)
+    """
+    logger.info("추출 백엔드와 명세서 생성 프로세스를 미리 준비합니다...")
+    if importlib.util.find_spec('jpype') is None:
+        logger.warning(
+            "jpype1이 설치되어 있지 않아 tabula가 요청마다 java 프로세스를 새로 실행합니다. "
+            "'pip install jpype1'로 설치하면 JVM을 재사용합니다."
+        )
+    if render_pool is not None:
+        render_pool.start_workers()
+    try:
+        sample = render_paystub({'구분': '직원', '성명': '예열', '사원번호': 0}, "지급일 정보 없음")
+        tabula.read_pdf(io.BytesIO(sample), pages='1', lattice=True,
+                        pandas_options={'header': None}, multiple_tables=True)
+        with _fitz_lock:
+            fitz.open(stream=sample, filetype="pdf").close()
+        logger.info("추출 백엔드 준비 완료.")
+    except Exception as e:
+        logger.warning(f"추출 백엔드 예열 실패 (첫 요청에서 다시 시도됩니다): {e}")
+
+
+def extract_uploaded_pdf(content_type, body):
+    """
+    요청 본문에서 급여대장 PDF bytes를 꺼냅니다.
+    - multipart/form-data: 'file' 필드의 내용
+    - 그 외(application/pdf 등): 본문 전체
+    PDF가 아니면 None.
+    """
+    if content_type.startswith('multipart/form-data'):
+        message = BytesParser(policy=email_policy.HTTP).parsebytes(
+            b"Content-Type: " + content_type.encode('latin-1') + b"\r\n\r\n" + body
+        )
+        data = None
+        for part in message.iter_parts():
+            if part.get_param('name', header='content-disposition') == 'file':
+                data = part.get_payload(decode=True)
+                break
+    else:
+        data = body
+    if not data or not data.startswith(b"%PDF"):
+        return None
+    return data
+
+
+class PaystubRequestHandler(BaseHTTPRequestHandler):
+    """
+    HTTP 요청 처리:
+    - POST /paystubs : 급여대장 PDF 업로드 (application/pdf 본문 또는 multipart의 'file' 필드)
+                       → 직원별 명세서 PDF와 검증결과.txt를 담은 ZIP을 스트리밍 응답
+    - GET /health    : 상태 확인
+    업로드는 디스크에 저장하지 않고 메모리에서 바로 처리합니다.
+    """
+    server_version = "PayrollService/0.4"
+
+    def log_message(self, format, *args):
+        logger.info(f"{self.address_string()} - {format % args}")
+
+    def send_text(self, code, text, extra_headers=None):
+        body = text.encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', 'text/plain; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (extra_headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.split('?')[0] != '/health':
+            self.send_text(404, "지원하지 않는 경로입니다.\n")
+            return
+        self.send_text(200, "ok\n")
+
+    def do_POST(self):
+        if self.path.split('?')[0] != '/paystubs':
+            self.send_text(404, "지원하지 않는 경로입니다.\n")
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+        except ValueError:
+            self.close_connection = True
+            self.send_text(400, "Content-Length 값이 올바르지 않습니다.\n")
+            return
+        if length <= 0:
+            self.send_text(411, "Content-Length가 필요합니다.\n")
+            return
+        if length > MAX_UPLOAD_BYTES:
+            self.close_connection = True
+            self.send_text(413, f"업로드 크기가 너무 큽니다. (최대 {MAX_UPLOAD_BYTES // (1024 * 1024)}MB)\n")
+            return
+
+        # 동시에 처리하는 요청 수 제한: 자리가 나지 않으면 503으로 응답
+        if not self.server.request_slots.acquire(timeout=self.server.queue_timeout):
+            self.close_connection = True
+            self.send_text(503, "처리 중인 요청이 많습니다. 잠시 후 다시 시도해주세요.\n",
+                           {'Retry-After': '5'})
+            return
+
+        try:
+            body = self.rfile.read(length)
+            pdf_bytes = extract_uploaded_pdf(self.headers.get('Content-Type', ''), body)
+            if pdf_bytes is None:
+                self.send_text(400, "급여대장 PDF를 찾을 수 없습니다. ('file' 필드 또는 application/pdf 본문)\n")
+                return
+
+            try:
+                result = process_ledger(pdf_bytes, executor=self.server.executor)
+            except Exception as e:
+                logger.exception(f"급여대장 처리 중 예외 발생: {e}")
+                self.send_text(500, f"급여대장 처리 중 오류가 발생했습니다: {e}\n")
+                return
+            if result is None:
+                self.send_text(422, "급여 데이터를 PDF에서 추출하지 못했습니다.\n")
+                return
+
+            # ZIP은 메모리에 모아 두지 않고 소켓으로 바로 씀 (연결 종료로 응답 끝을 표시)
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/zip')
+            self.send_header('Content-Disposition', 'attachment; filename="paystubs.zip"')
+            self.send_header('Connection', 'close')
+            self.end_headers()
+            self.close_connection = True
+            with zipfile.ZipFile(self.wfile, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+                for filename, data in result['paystubs']:
+                    zf.writestr(filename, data)
+                zf.writestr(VALIDATION_REPORT_NAME, result['report'])
+            logger.info(f"급여 명세서 {len(result['paystubs'])}건을 ZIP으로 응답했습니다.")
+        finally:
+            self.server.request_slots.release()
+
+
+class PaystubHTTPServer(ThreadingHTTPServer):
+    """
+    요청마다 스레드를 띄우되, 다음 자원은 서버 수명 동안 공유(예열 상태 유지):
+    - executor: 직원별 명세서 PDF를 생성하는 작업 프로세스 풀 (make_render_pool)
+    - request_slots: 동시에 처리하는 요청 수 제한 (max_concurrent)
+    """
+    daemon_threads = True
+
+    def __init__(self, server_address, workers=4, max_concurrent=2, queue_timeout=30):
+        super().__init__(server_address, PaystubRequestHandler)
+        self.executor = make_render_pool(workers)
+        self.request_slots = threading.BoundedSemaphore(max_concurrent)
+        self.queue_timeout = queue_timeout
+
+    def server_close(self):
+        super().server_close()
+        self.executor.shutdown(wait=True)
+
+
+def run_paystub_service(host='127.0.0.1', port=8000, workers=4, max_concurrent=2):
+    """백엔드를 예열한 뒤 HTTP 서비스를 시작하고 Ctrl+C까지 요청을 처리."""
+    server = PaystubHTTPServer((host, port), workers=workers, max_concurrent=max_concurrent)
+    warm_up_backends(server.executor)
+    logger.info(f"급여 명세서 서비스 시작: http://{host}:{port}/paystubs (동시 처리 최대 {max_concurrent}건)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("서비스를 종료합니다.")
+    finally:
+        server.server_close()
+
+
+SERVICE_COMMANDS = ('serve', 'watch')
+
+
+def parse_command_line(argv=None):
+    """
+    명령행 인자 해석. 첫 인자가 'serve' / 'watch'일 때만 해석하고, 그 외에는 None을 반환하여
+    기존처럼 UI(또는 Colab) 모드로 실행합니다. (Colab 커널의 '-f kernel.json' 같은 인자는 건드리지 않음)
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+    if not argv or argv[0] not in SERVICE_COMMANDS:
+        return None
+
+    parser = argparse.ArgumentParser(description="급여 명세서 자동 생성 프로그램")
+    subparsers = parser.add_subparsers(dest='command')
+
+    serve_parser = subparsers.add_parser('serve', help="급여대장 PDF를 받아 명세서 ZIP을 돌려주는 로컬 HTTP 서비스")
+    serve_parser.add_argument('--host', default='127.0.0.1', help="바인딩 주소 (기본: 127.0.0.1)")
+    serve_parser.add_argument('--port', type=int, default=8000, help="포트 (기본: 8000)")
+    serve_parser.add_argument('--workers', type=int, default=4, help="명세서 생성 작업 프로세스 수 (기본: 4)")
+    serve_parser.add_argument('--max-concurrent', type=int, default=2, help="동시에 처리할 요청 수 (기본: 2)")
+
+    watch_parser = subparsers.add_parser('watch', help="폴더에 들어오는 급여대장 PDF를 자동으로 처리")
+    watch_parser.add_argument('watch_dir', help="감시할 폴더")
+    watch_parser.add_argument('--output', default="generated_paystubs", help="결과 폴더 (기본: generated_paystubs)")
+    watch_parser.add_argument('--interval', type=float, default=2.0, help="폴더 확인 간격(초) (기본: 2)")
+    watch_parser.add_argument('--settle', type=float, default=5.0, help="쓰기 완료로 판단할 무변경 시간(초) (기본: 5)")
+    watch_parser.add_argument('--workers', type=int, default=4, help="명세서 생성 작업 프로세스 수 (기본: 4)")
+    watch_parser.add_argument('--max-ledgers', type=int, default=2, help="동시에 처리할 급여대장 수 (기본: 2)")
+
+    return parser.parse_args(argv)
+
+
+# 7. 감시 폴더 모드 (공유 폴더에 들어오는 급여대장 자동 처리)
+class LedgerFolderWatcher:
+    """
+    감시 폴더 모드:
+    - poll_interval초마다 폴더의 수정 시각(mtime)만 확인하고, 바뀌었을 때만 목록을 다시 읽음
+      (네트워크 드라이브 대비로 rescan_interval초마다 한 번은 목록을 확인)
+    - 이미 처리한 파일은 (크기, 수정 시각)이 같으면 다시 처리하지 않음
+    - 새 PDF는 settle_seconds 동안 크기와 수정 시각이 변하지 않아야(복사 완료) 처리 대기열에 넣음
+    - 급여대장은 max_ledgers개씩 병렬 처리, 직원별 명세서는 workers개 프로세스 풀에서 생성
+    - 결과는 output_root/<급여대장 파일명>/ 폴더에 명세서 PDF와 검증결과.txt로 저장
+      (임시 폴더에 모두 쓴 뒤 기존 폴더와 교체하므로, 수정된 급여대장에서 빠진 직원의 명세서는 남지 않음)
+    - 처리에 실패한 파일은 크기나 수정 시각이 바뀔 때까지 다시 처리하지 않음
+    - 같은 급여대장은 동시에 두 번 처리하지 않음: 처리 중에 수정본이 들어오면 앞선 처리가 끝난 뒤에 처리
+    """
+    def __init__(self, watch_dir, output_root="generated_paystubs", poll_interval=2.0,
+                 settle_seconds=5.0, rescan_interval=60.0, workers=4, max_ledgers=2):
+        self.watch_dir = watch_dir
+        self.output_root = output_root
+        self.poll_interval = poll_interval
+        self.settle_seconds = settle_seconds
+        self.rescan_interval = rescan_interval
+        self.render_executor = make_render_pool(workers)
+        self.ledger_executor = ThreadPoolExecutor(max_workers=max_ledgers)
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+        self._seen = {}     # 경로 → (크기, 수정 시각): 처리했거나 처리 대기 중인 파일
+        self._pending = {}  # 경로 → ((크기, 수정 시각), 마지막 변경 감지 시각): 쓰기 완료를 기다리는 파일
+        self._in_flight = set()  # 지금 처리 중인 경로
+        self._dir_mtime_ns = None
+        self._last_scan = 0.0
+
+    def ledger_output_dir(self, path):
+        ledger_name = os.path.splitext(os.path.basename(path))[0]
+        return os.path.join(self.output_root, ledger_name)
+
+    def _already_processed(self, path, stat_result):
+        """프로그램 재시작 시: 검증결과.txt가 급여대장보다 나중에 만들어졌으면 처리된 것으로 봄."""
+        report_path = os.path.join(self.ledger_output_dir(path), VALIDATION_REPORT_NAME)
+        try:
+            return os.stat(report_path).st_mtime_ns >= stat_result.st_mtime_ns
+        except OSError:
+            return False
+
+    def _scan_directory(self, now):
+        self._last_scan = now
+        present = set()
+        with os.scandir(self.watch_dir) as entries:
+            for entry in entries:
+                name = entry.name
+                # 숨김 파일, 오피스 임시 파일(~$), PDF가 아닌 파일은 무시
+                if name.startswith(('.', '~$')) or not name.lower().endswith('.pdf'):
+                    continue
+                try:
+                    if not entry.is_file():
+                        continue
+                    st = entry.stat()
+                except OSError:
+                    continue
+                path = entry.path
+                signature = (st.st_size, st.st_mtime_ns)
+                present.add(path)
+                with self._lock:
+                    if self._seen.get(path) == signature or path in self._pending:
+                        continue
+                    if path not in self._seen and self._already_processed(path, st):
+                        self._seen[path] = signature
+                        continue
+                    self._pending[path] = (signature, now)
+                logger.info(f"새 급여대장 감지: '{name}' (쓰기 완료 대기 중)")
+
+        # 폴더에서 사라진 파일은 잊어버려, 같은 이름으로 다시 들어오면 새로 처리
+        with self._lock:
+            for path in [p for p in self._seen if p not in present]:
+                del self._seen[path]
+            for path in [p for p in self._pending if p not in present]:
+                del self._pending[path]
+
+    def _check_pending(self, now):
+        """쓰기 완료를 기다리는 파일만 stat하여, 충분히 안정된 파일을 처리 대기열에 넣음."""
+        ready = []
+        with self._lock:
+            for path, (signature, since) in list(self._pending.items()):
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    del self._pending[path]
+                    continue
+                current = (st.st_size, st.st_mtime_ns)
+                if current != signature:
+                    self._pending[path] = (current, now)
+                elif st.st_size > 0 and now - since >= self.settle_seconds:
+                    if path in self._in_flight:
+                        # 이전 버전을 처리 중이면 대기열에 남겨 두고, 처리가 끝난 뒤의 확인에서 넣음
+                        continue
+                    del self._pending[path]
+                    self._seen[path] = current
+                    self._in_flight.add(path)
+                    ready.append(path)
+        for path in ready:
+            self.ledger_executor.submit(self._process_ledger_file, path)
+
+    def poll_once(self):
+        """폴더를 한 번 확인. 폴더 mtime이 그대로면 목록을 다시 읽지 않습니다."""
+        now = time.monotonic()
+        try:
+            dir_mtime_ns = os.stat(self.watch_dir).st_mtime_ns
+            if dir_mtime_ns != self._dir_mtime_ns or now - self._last_scan >= self.rescan_interval:
+                self._dir_mtime_ns = dir_mtime_ns
+                self._scan_directory(now)
+        except OSError as e:
+            logger.error(f"감시 폴더 '{self.watch_dir}'를 읽지 못했습니다: {e}")
+            return
+        if self._pending:
+            self._check_pending(now)
+
+    def _process_ledger_file(self, path):
+        name = os.path.basename(path)
+        started = time.monotonic()
+        logger.info(f"'{name}' 처리를 시작합니다...")
+        try:
+            result = process_ledger(path, executor=self.render_executor)
+            if result is None:
+                logger.error(f"'{name}': 급여 데이터 추출 실패. 파일을 수정하여 다시 넣으면 재처리합니다.")
+                return
+
+            output_dir = self.ledger_output_dir(path)
+            self._write_outputs(output_dir, result)
+            logger.info(
+                f"'{name}' 처리 완료: 명세서 {len(result['paystubs'])}건 → '{output_dir}' "
+                f"({time.monotonic() - started:.1f}초)"
+            )
+        except Exception as e:
+            # _seen에 남겨 두어, 같은 파일을 목록 확인 때마다 다시 처리하지 않음
+            logger.exception(f"'{name}' 처리 중 예외 발생: {e}")
+            logger.error(f"'{name}': 파일이 바뀌거나 프로그램을 다시 시작할 때까지 재처리하지 않습니다.")
+        finally:
+            with self._lock:
+                self._in_flight.discard(path)
+
+    def _write_outputs(self, output_dir, result):
+        """
+        결과를 처리마다 새로 만든 임시 폴더(.<급여대장 파일명>-XXXX)에 모두 쓴 뒤 기존 결과 폴더와 교체.
+        검증결과.txt는 마지막에 기록합니다 (재시작 시 처리 완료 표시로 사용).
+        """
+        ledger_name = os.path.basename(output_dir)
+        os.makedirs(self.output_root, exist_ok=True)
+        staging_dir = tempfile.mkdtemp(prefix=f".{ledger_name}-", dir=self.output_root)
+        retired_dir = f"{staging_dir}.old"
+        try:
+            # mkdtemp는 소유자 전용(0700)으로 만들므로 결과 폴더의 권한을 상위 폴더와 맞춤
+            os.chmod(staging_dir, stat.S_IMODE(os.stat(self.output_root).st_mode))
+            for filename, data in result['paystubs']:
+                with open(os.path.join(staging_dir, filename), 'wb') as f:
+                    f.write(data)
+            with open(os.path.join(staging_dir, VALIDATION_REPORT_NAME), 'w', encoding='utf-8') as f:
+                f.write(result['report'])
+
+            if os.path.exists(output_dir):
+                os.rename(output_dir, retired_dir)
+            try:
+                os.rename(staging_dir, output_dir)
+            except OSError:
+                if os.path.exists(retired_dir):
+                    os.rename(retired_dir, output_dir)
+                raise
+        except BaseException:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            raise
+        shutil.rmtree(retired_dir, ignore_errors=True)
+
+    def run(self):
+        """stop()이 호출되거나 Ctrl+C가 눌릴 때까지 폴더를 감시."""
+        warm_up_backends(self.render_executor)
+        logger.info(
+            f"'{os.path.abspath(self.watch_dir)}' 폴더 감시 시작 "
+            f"(확인 간격 {self.poll_interval}초, 쓰기 완료 대기 {self.settle_seconds}초)"
+        )
+        try:
+            while not self._stop_event.is_set():
+                self.poll_once()
+                self._stop_event.wait(self.poll_interval)
+        except KeyboardInterrupt:
+            logger.info("폴더 감시를 종료합니다.")
+        finally:
+            self.close()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def close(self):
+        """처리 중인 급여대장을 마친 뒤 작업 풀을 종료."""
+        self.ledger_executor.shutdown(wait=True)
+        self.render_executor.shutdown(wait=True)
+
+
+# 8. Tkinter UI 클래스 및 실행 코드
 class PayrollApp:
     """
     Tkinter를 이용한 UI:
     1) 급여대장 PDF 선택
     2) '급여 명세서 생성' 버튼 클릭 시 extract → PDF 생성
-    3) 상태 텍스트(Text 위젯)에 로그를 실시간으로 출력
+    3) '이메일 발송' 버튼 클릭 시 생성된 명세서를 수신자 목록(CSV)대로 발송
+    4) 상태 텍스트(Text 위젯)에 로그를 실시간으로 출력
     """
 
     class TextHandler(logging.Handler):
@@ -498,7 +1395,7 @@ class PayrollApp:
     def __init__(self, master):
         self.master = master
         master.title("급여 명세서 자동 생성 프로그램 v0.4 (강화된 로깅)")
-        master.geometry("550x350")
+        master.geometry("550x400")
 
         # 상태 표시용 Text 위젯
         self.status_text = tk.Text(master, height=8, wrap=tk.WORD, state=tk.DISABLED)
@@ -542,6 +1439,15 @@ class PayrollApp:
         )
         self.btn_generate.pack(pady=5, padx=10, fill=tk.X)
 
+        # 이메일 발송 버튼
+        self.btn_send = tk.Button(
+            master,
+            text="3. 급여 명세서 이메일 발송",
+            command=self.send_paystubs,
+            state=tk.DISABLED
+        )
+        self.btn_send.pack(pady=5, padx=10, fill=tk.X)
+
         # 저장 폴더 열기 버튼
         self.btn_open_folder = tk.Button(
             master,
@@ -554,6 +1460,7 @@ class PayrollApp:
         # 초기 상태
         self.input_pdf_path = ""
         self.output_dir = "generated_paystubs"
+        self.generated_files = []
 
     def select_input_file(self):
         """
@@ -612,12 +1519,7 @@ class PayrollApp:
 
             for employee_record in payroll_data_list:
                 if employee_record.get('구분') == '직원':
-                    emp_name = str(employee_record.get('성명', '정보없음')).replace(" ", "_")
-                    emp_id = str(employee_record.get('사원번호', 'ID없음'))
-                    output_filename = os.path.join(
-                        self.output_dir,
-                        f"{emp_name}_{emp_id}_급여명세서.pdf"
-                    )
+                    output_filename = os.path.join(self.output_dir, paystub_filename(employee_record))
                     pdf = PayStubPDF()
                     pdf.generate_paystub_pdf(employee_record, payment_date_on_ledger, output_filename)
                     generated_files_info.append(output_filename)
@@ -630,7 +1532,9 @@ class PayrollApp:
                 )
                 messagebox.showinfo("성공", final_message.split('\n')[0])
                 logger.info(final_message)
+                self.generated_files = generated_files_info
                 self.btn_open_folder.config(state=tk.NORMAL)
+                self.btn_send.config(state=tk.NORMAL)
             else:
                 messagebox.showwarning("알림", "처리할 직원 데이터가 없습니다.")
                 logger.warning("직원 데이터 없음. 생성할 파일이 없습니다.")
@@ -644,6 +1548,65 @@ class PayrollApp:
             self.btn_generate.config(state=tk.NORMAL)
             self.btn_select_file.config(state=tk.NORMAL)
 
+    def send_paystubs(self):
+        """
+        1) 수신자 목록 CSV('사원번호', '이메일' 열) 선택
+        2) 환경 변수(PAYROLL_SMTP_*)의 SMTP 설정으로 연결 풀 생성
+        3) 백그라운드 스레드에서 distribute_paystubs() 실행 후 발송 결과 보고서 저장
+        """
+        settings = smtp_settings_from_env()
+        if not settings or not settings['sender']:
+            messagebox.showerror("오류", "SMTP 설정이 없습니다. PAYROLL_SMTP_HOST, PAYROLL_SMTP_SENDER 환경 변수를 설정해주세요.")
+            logger.error("SMTP 설정(PAYROLL_SMTP_HOST / PAYROLL_SMTP_SENDER)이 없습니다.")
+            return
+
+        csv_path = filedialog.askopenfilename(
+            title="수신자 목록 CSV 파일을 선택하세요 (사원번호, 이메일)",
+            filetypes=(("CSV files", "*.csv"), ("All files", "*.*"))
+        )
+        if not csv_path:
+            logger.info("이메일 발송이 취소되었습니다.")
+            return
+
+        try:
+            recipients = load_recipients(csv_path)
+        except (OSError, csv.Error) as e:
+            messagebox.showerror("오류", f"수신자 목록을 읽지 못했습니다: {e}")
+            logger.exception(f"수신자 목록 읽기 실패: {e}")
+            return
+
+        self.btn_send.config(state=tk.DISABLED)
+        self.btn_generate.config(state=tk.DISABLED)
+        logger.info(f"{len(self.generated_files)}건의 급여 명세서 이메일 발송을 시작합니다...")
+        files = list(self.generated_files)
+        report_path = os.path.join(self.output_dir, "발송결과.csv")
+
+        def worker():
+            pool = SMTPConnectionPool(
+                settings['host'], settings['port'],
+                username=settings['username'], password=settings['password'],
+                use_tls=settings['use_tls'], size=settings['pool_size']
+            )
+            try:
+                results = distribute_paystubs(
+                    files, recipients, pool, settings['sender'],
+                    rate_per_sec=settings['rate_per_sec']
+                )
+                write_delivery_report(results, report_path)
+                num_sent = sum(1 for r in results if r['상태'] == '성공')
+                summary = f"{len(results)}건 중 {num_sent}건 발송 완료.\n결과 보고서: {report_path}"
+                self.master.after(0, lambda: messagebox.showinfo("발송 완료", summary))
+            except Exception as e:
+                logger.exception(f"이메일 발송 중 예외 발생: {e}")
+                error_text = f"이메일 발송 중 예외 발생: {e}"
+                self.master.after(0, lambda: messagebox.showerror("치명적 오류", error_text))
+            finally:
+                pool.close()
+                self.master.after(0, lambda: (self.btn_send.config(state=tk.NORMAL),
+                                              self.btn_generate.config(state=tk.NORMAL)))
+
+        threading.Thread(target=worker, daemon=True).start()
+
     def open_output_folder(self):
         """
         생성된 급여명세서가 저장된 폴더를 OS 탐색기로 엶.
@@ -668,8 +1631,36 @@ class PayrollApp:
 
 # --- 메인 실행 부분 ---
 if __name__ == "__main__":
-    # Colab 환경인지 로컬 환경인지 감지하여 실행 방식 결정
-    if 'google.colab' in sys.modules:
+    multiprocessing.freeze_support()  # PyInstaller로 패키징한 실행 파일에서 작업 프로세스 지원
+    # Colab 환경 / 서비스 모드 / 로컬 환경을 감지하여 실행 방식 결정
+    command_args = None if 'google.colab' in sys.modules else parse_command_line()
+    if command_args is not None:
+        logger.addHandler(make_console_handler())
+        # 서비스/감시 모드는 폰트 없이는 명세서를 만들 수 없으므로 작업 프로세스를 띄우기 전에 확인
+        if find_font_file('NanumGothic.ttf') is None:
+            logger.error(
+                f"폰트 파일을 찾을 수 없습니다: {resource_path('NanumGothic.ttf')}. "
+                "'NanumGothic.ttf' 파일을 올바른 위치에 두고 다시 실행해주세요."
+            )
+            sys.exit(1)
+
+    if command_args is not None and command_args.command == 'serve':
+        run_paystub_service(
+            host=command_args.host,
+            port=command_args.port,
+            workers=command_args.workers,
+            max_concurrent=command_args.max_concurrent
+        )
+    elif command_args is not None and command_args.command == 'watch':
+        LedgerFolderWatcher(
+            command_args.watch_dir,
+            output_root=command_args.output,
+            poll_interval=command_args.interval,
+            settle_seconds=command_args.settle,
+            workers=command_args.workers,
+            max_ledgers=command_args.max_ledgers
+        ).run()
+    elif 'google.colab' in sys.modules:
         logger.info("Colab 환경 감지: UI 없이 데이터 처리 및 PDF 생성 테스트를 진행합니다.")
         # 0. Colab에 'NanumGothic.ttf' 와 급여대장 PDF 파일 업로드 필요
         font_file_colab = 'NanumGothic.ttf'
@@ -697,11 +1688,7 @@ if __name__ == "__main__":
 
                 for employee_record in payroll_data_list:
                     if employee_record.get('구분') == '직원':
-                        emp_name = str(employee_record.get('성명', '정보없음')).replace(" ", "_")
-                        emp_id = str(employee_record.get('사원번호', 'ID없음'))
-                        output_filename = os.path.join(
-                            output_dir_colab, f"{emp_name}_{emp_id}_급여명세서.pdf"
-                        )
+                        output_filename = os.path.join(output_dir_colab, paystub_filename(employee_record))
                         pdf = PayStubPDF()
                         pdf.generate_paystub_pdf(employee_record, payment_date_on_ledger, output_filename)
                 logger.info(f"\n직원별 급여 명세서 PDF 생성이 완료되었습니다. '{output_dir_colab}' 폴더를 확인하세요.")
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# main.py는 패키지가 아니므로 저장소 루트를 임포트 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
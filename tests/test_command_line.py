@@ -0,0 +1,29 @@
+"""
+명령행 인자 해석(parse_command_line) 검증.
+"""
+import main
+
+
+def test_no_arguments_runs_ui_mode():
+    assert main.parse_command_line([]) is None
+
+
+def test_colab_kernel_arguments_are_ignored():
+    argv = ['-f', '/root/.local/share/jupyter/runtime/kernel-abc.json']
+    assert main.parse_command_line(argv) is None
+
+
+def test_serve_options():
+    args = main.parse_command_line(['serve', '--port', '9000', '--max-concurrent', '3'])
+    assert args.command == 'serve'
+    assert args.port == 9000
+    assert args.max_concurrent == 3
+    assert args.host == '127.0.0.1'
+
+
+def test_watch_options():
+    args = main.parse_command_line(['watch', 'drop', '--settle', '1.5'])
+    assert args.command == 'watch'
+    assert args.watch_dir == 'drop'
+    assert args.settle == 1.5
+    assert args.output == 'generated_paystubs'
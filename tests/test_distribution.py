@@ -0,0 +1,217 @@
+"""
+급여명세서 이메일 발송 단계(distribute_paystubs)를 로컬 SMTP 대역 서버로 검증.
+"""
+import csv
+import smtplib
+import socketserver
+import threading
+import time
+
+import pytest
+
+import main
+
+
+class StubSMTPServer(socketserver.ThreadingTCPServer):
+    """
+    테스트용 최소 SMTP 서버.
+    - connections: 지금까지 받은 연결 수
+    - delivered: 수신 완료된 수신자 주소 목록
+    - rcpt_replies: 수신자별로 미리 정해 둔 RCPT 응답 목록 (차례대로 소비)
+    - drop_after_data: 처음 N번의 DATA 명령에서는 응답 없이 연결을 끊음
+    - auth_reply: 지정하면 EHLO에서 AUTH를 광고하고 모든 AUTH 명령에 이 응답을 보냄
+    - open_connections: 아직 클라이언트가 닫지 않은 연결 수
+    """
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), StubSMTPHandler)
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.delivered = []
+        self.rcpt_replies = {}
+        self.drop_after_data = 0
+        self.auth_reply = None
+        self.open_connections = 0
+
+
+class StubSMTPHandler(socketserver.StreamRequestHandler):
+    def reply(self, line):
+        self.wfile.write(line.encode('ascii') + b"\r\n")
+
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.connections += 1
+            server.open_connections += 1
+        try:
+            self.converse()
+        finally:
+            with server.lock:
+                server.open_connections -= 1
+
+    def converse(self):
+        server = self.server
+        self.reply("220 stub ESMTP")
+        recipients = []
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode('ascii', 'replace').strip()
+            verb = command.split(' ', 1)[0].upper()
+            if verb == 'EHLO' and server.auth_reply:
+                self.reply("250-stub")
+                self.reply("250 AUTH PLAIN LOGIN")
+            elif verb in ('EHLO', 'HELO'):
+                self.reply("250 stub")
+            elif verb == 'AUTH':
+                self.reply(server.auth_reply)
+            elif verb == 'MAIL':
+                recipients = []
+                self.reply("250 OK")
+            elif verb == 'RCPT':
+                address = command.split(':', 1)[1].strip().strip('<>')
+                with server.lock:
+                    replies = server.rcpt_replies.get(address)
+                    response = replies.pop(0) if replies else "250 OK"
+                if response.startswith('250'):
+                    recipients.append(address)
+                self.reply(response)
+            elif verb == 'DATA':
+                with server.lock:
+                    drop = server.drop_after_data > 0
+                    if drop:
+                        server.drop_after_data -= 1
+                if drop:
+                    return
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                while self.rfile.readline() not in (b".\r\n", b""):
+                    pass
+                with server.lock:
+                    server.delivered.extend(recipients)
+                self.reply("250 OK")
+            elif verb == 'RSET':
+                recipients = []
+                self.reply("250 OK")
+            elif verb == 'QUIT':
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("250 OK")
+
+
+@pytest.fixture
+def smtp_server():
+    server = StubSMTPServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def pool(smtp_server):
+    pool = main.SMTPConnectionPool('127.0.0.1', smtp_server.server_address[1], use_tls=False, size=3, timeout=5)
+    yield pool
+    pool.close()
+
+
+def make_paystubs(tmp_path, count):
+    files = []
+    recipients = {}
+    for i in range(count):
+        path = tmp_path / f"홍_길동_{i}_급여명세서.pdf"
+        path.write_bytes(b"%PDF-1.4 test")
+        files.append(str(path))
+        recipients[str(i)] = f"user{i}@example.com"
+    return files, recipients
+
+
+def distribute(files, recipients, pool):
+    return main.distribute_paystubs(files, recipients, pool, "hr@example.com",
+                                    rate_per_sec=0, max_retries=3, backoff_base=0.01)
+
+
+def test_parse_paystub_filename_keeps_underscored_names():
+    assert main.parse_paystub_filename("out/홍_길동_1001_급여명세서.pdf") == ("홍 길동", "1001")
+    assert main.parse_paystub_filename("out/보고서.pdf") == (None, None)
+
+
+def test_connections_are_reused(tmp_path, smtp_server, pool):
+    files, recipients = make_paystubs(tmp_path, 30)
+
+    results = distribute(files, recipients, pool)
+
+    assert all(r['상태'] == '성공' for r in results)
+    assert sorted(smtp_server.delivered) == sorted(recipients.values())
+    assert smtp_server.connections <= pool.size
+
+
+def test_temporary_recipient_rejection_is_retried(tmp_path, smtp_server, pool):
+    files, recipients = make_paystubs(tmp_path, 2)
+    smtp_server.rcpt_replies['user0@example.com'] = ["451 greylisted, try again later"]
+
+    results = {r['사원번호']: r for r in distribute(files, recipients, pool)}
+
+    assert results['0']['상태'] == '성공'
+    assert results['0']['시도횟수'] == 2
+    assert 'user0@example.com' in smtp_server.delivered
+
+
+def test_permanent_recipient_rejection_is_not_retried(tmp_path, smtp_server, pool):
+    files, recipients = make_paystubs(tmp_path, 2)
+    smtp_server.rcpt_replies['user1@example.com'] = ["550 no such user"] * 3
+
+    results = {r['사원번호']: r for r in distribute(files, recipients, pool)}
+
+    assert results['1']['상태'] == '실패'
+    assert results['1']['시도횟수'] == 1
+    assert '550' in results['1']['오류']
+    assert results['0']['상태'] == '성공'
+
+
+def test_dropped_connection_is_replaced_and_retried(tmp_path, smtp_server, pool):
+    files, recipients = make_paystubs(tmp_path, 1)
+    smtp_server.drop_after_data = 1
+
+    results = distribute(files, recipients, pool)
+
+    assert results[0]['상태'] == '성공'
+    assert results[0]['시도횟수'] == 2
+    assert smtp_server.connections == 2
+
+
+def test_delivery_report_rows(tmp_path, smtp_server, pool):
+    files, recipients = make_paystubs(tmp_path, 3)
+    del recipients['2']
+    report_path = tmp_path / "발송결과.csv"
+
+    main.write_delivery_report(distribute(files, recipients, pool), str(report_path))
+
+    with open(report_path, newline='', encoding='utf-8-sig') as f:
+        rows = {row['사원번호']: row for row in csv.DictReader(f)}
+    assert rows['0']['상태'] == '성공'
+    assert rows['0']['이메일'] == 'user0@example.com'
+    assert rows['0']['시도횟수'] == '1'
+    assert rows['2']['상태'] == '수신자 없음'
+    assert rows['2']['시도횟수'] == '0'
+
+
+def test_authentication_failure_aborts_run_and_closes_connections(tmp_path, smtp_server):
+    files, recipients = make_paystubs(tmp_path, 50)
+    smtp_server.auth_reply = "535 authentication failed"
+    pool = main.SMTPConnectionPool('127.0.0.1', smtp_server.server_address[1], username='hr', password='wrong',
+                                   use_tls=False, size=3, timeout=5)
+
+    with pytest.raises(smtplib.SMTPAuthenticationError):
+        distribute(files, recipients, pool)
+    pool.close()
+
+    assert smtp_server.connections <= pool.size
+    deadline = time.monotonic() + 2
+    while smtp_server.open_connections and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert smtp_server.open_connections == 0
@@ -0,0 +1,179 @@
+"""
+로컬 HTTP 서비스 모드(PaystubHTTPServer) 검증.
+process_ledger는 가짜 함수로 바꿔 PDF 추출/생성 없이 실행합니다.
+"""
+import http.client
+import io
+import os
+import signal
+import socket
+import threading
+import zipfile
+
+import pytest
+
+import main
+
+LEDGER_BYTES = b"%PDF-1.4\r\n\x00\xff binary \r\n--not-a-boundary\r\n\xed\x95\x9c"
+
+
+@pytest.fixture
+def received(monkeypatch):
+    """가짜 process_ledger가 받은 PDF bytes 목록."""
+    received = []
+
+    def fake_process_ledger(pdf_source, executor=None):
+        received.append(pdf_source)
+        if b"no-data" in pdf_source:
+            return None
+        return {
+            'payment_date': "2025년5월25일",
+            'paystubs': [("홍_길동_1_급여명세서.pdf", b"%PDF stub 1"), ("김_철수_2_급여명세서.pdf", b"%PDF stub 2")],
+            'report': "급여대장 검증 결과\n",
+        }
+
+    monkeypatch.setattr(main, 'process_ledger', fake_process_ledger)
+    return received
+
+
+def start_server(max_concurrent=2, queue_timeout=30):
+    server = main.PaystubHTTPServer(('127.0.0.1', 0), workers=1,
+                                    max_concurrent=max_concurrent, queue_timeout=queue_timeout)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+@pytest.fixture
+def server(received):
+    server = start_server()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def post(server, body, content_type='application/pdf'):
+    conn = http.client.HTTPConnection('127.0.0.1', server.server_address[1], timeout=10)
+    conn.request('POST', '/paystubs', body=body, headers={'Content-Type': content_type})
+    response = conn.getresponse()
+    data = response.read()
+    conn.close()
+    return response, data
+
+
+def raw_request(server, request_bytes):
+    """http.client가 자동으로 고쳐 주는 잘못된 헤더를 그대로 보내기 위한 저수준 요청."""
+    with socket.create_connection(('127.0.0.1', server.server_address[1]), timeout=10) as sock:
+        sock.sendall(request_bytes)
+        chunks = []
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    status_line = b"".join(chunks).split(b"\r\n", 1)[0]
+    return int(status_line.split()[1])
+
+
+def test_pdf_body_returns_zip_with_stubs_and_report(server, received):
+    response, data = post(server, LEDGER_BYTES)
+
+    assert response.status == 200
+    assert response.getheader('Content-Type') == 'application/zip'
+    with zipfile.ZipFile(io.BytesIO(data)) as zf:
+        assert sorted(zf.namelist()) == sorted(
+            ["홍_길동_1_급여명세서.pdf", "김_철수_2_급여명세서.pdf", main.VALIDATION_REPORT_NAME]
+        )
+        assert zf.read("홍_길동_1_급여명세서.pdf") == b"%PDF stub 1"
+        assert zf.read(main.VALIDATION_REPORT_NAME).decode('utf-8') == "급여대장 검증 결과\n"
+    assert received == [LEDGER_BYTES]
+
+
+def test_multipart_upload_round_trips_binary_pdf(server, received):
+    boundary = "paystubboundary"
+    body = (
+        f"--{boundary}\r\n"
+        'Content-Disposition: form-data; name="note"\r\n\r\n'
+        "ignored\r\n"
+        f"--{boundary}\r\n"
+        'Content-Disposition: form-data; name="file"; filename="ledger.pdf"\r\n'
+        "Content-Type: application/pdf\r\n\r\n"
+    ).encode('ascii') + LEDGER_BYTES + f"\r\n--{boundary}--\r\n".encode('ascii')
+
+    response, _ = post(server, body, f"multipart/form-data; boundary={boundary}")
+
+    assert response.status == 200
+    assert received == [LEDGER_BYTES]
+
+
+def test_non_pdf_upload_is_rejected(server, received):
+    response, _ = post(server, b"hello")
+    assert response.status == 400
+    assert received == []
+
+
+def test_unextractable_ledger_returns_422(server):
+    response, _ = post(server, b"%PDF no-data")
+    assert response.status == 422
+
+
+def test_missing_content_length_returns_411(server):
+    status = raw_request(server, b"POST /paystubs HTTP/1.1\r\nHost: x\r\nConnection: close\r\n\r\n")
+    assert status == 411
+
+
+def test_invalid_content_length_returns_400(server):
+    status = raw_request(server, b"POST /paystubs HTTP/1.1\r\nHost: x\r\nContent-Length: abc\r\n\r\n")
+    assert status == 400
+
+
+def test_oversized_upload_returns_413(server):
+    request = f"POST /paystubs HTTP/1.1\r\nHost: x\r\nContent-Length: {main.MAX_UPLOAD_BYTES + 1}\r\n\r\n"
+    assert raw_request(server, request.encode('ascii')) == 413
+
+
+def test_requests_over_max_concurrent_get_503(monkeypatch):
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow_process_ledger(pdf_source, executor=None):
+        started.set()
+        release.wait(10)
+        return {'payment_date': "", 'paystubs': [], 'report': ""}
+
+    monkeypatch.setattr(main, 'process_ledger', slow_process_ledger)
+    server = start_server(max_concurrent=1, queue_timeout=0.2)
+    try:
+        first = {}
+        thread = threading.Thread(target=lambda: first.update(status=post(server, LEDGER_BYTES)[0].status))
+        thread.start()
+        assert started.wait(10)
+
+        response, _ = post(server, LEDGER_BYTES)
+        assert response.status == 503
+        assert response.getheader('Retry-After') == '5'
+
+        release.set()
+        thread.join(10)
+        assert first['status'] == 200
+    finally:
+        release.set()
+        server.shutdown()
+        server.server_close()
+
+
+def test_render_pool_survives_failed_warm_up_and_killed_worker(tmp_path, monkeypatch):
+    # 폰트가 없는 폴더에서 실행: 예열이 실패해도 풀이 깨지지 않아야 함
+    monkeypatch.chdir(tmp_path)
+    pool = main.make_render_pool(1)
+    try:
+        pool.start_workers()
+        (pid,) = set(pool.map(main._worker_pid, [0]))
+
+        os.kill(pid, signal.SIGKILL)
+        assert set(pool.map(main._worker_pid, [0])) != {pid}
+
+        with pytest.raises(RuntimeError, match="명세서 생성 실패"):
+            pool.map(main.render_paystub_task, [{'구분': '직원', '성명': '홍길동', '사원번호': 1}], ["지급일"])
+        assert len(pool.map(main._worker_pid, [0])) == 1
+    finally:
+        pool.shutdown()
@@ -0,0 +1,145 @@
+"""
+감시 폴더 모드(LedgerFolderWatcher)의 재처리 규칙과 결과 폴더 교체 검증.
+process_ledger는 가짜 함수로 바꿔 PDF 추출/생성 없이 실행합니다.
+"""
+import os
+import threading
+import time
+
+import pytest
+
+import main
+
+
+class ImmediateExecutor:
+    """제출한 작업을 바로 실행하여 테스트에서 처리 완료를 기다릴 필요가 없게 함."""
+    def submit(self, fn, *args):
+        fn(*args)
+
+    def shutdown(self, wait=True):
+        pass
+
+
+@pytest.fixture
+def folders(tmp_path):
+    watch_dir = tmp_path / "drop"
+    output_root = tmp_path / "out"
+    watch_dir.mkdir()
+    return watch_dir, output_root
+
+
+@pytest.fixture
+def watcher(folders):
+    watch_dir, output_root = folders
+    watcher = main.LedgerFolderWatcher(str(watch_dir), output_root=str(output_root),
+                                       settle_seconds=0, rescan_interval=0, workers=1)
+    watcher.ledger_executor = ImmediateExecutor()
+    yield watcher
+    watcher.close()
+
+
+def touch_ledger(path, content):
+    """내용을 바꾸고 수정 시각도 확실히 바뀌도록 설정."""
+    path.write_bytes(content)
+    stat_result = os.stat(path)
+    os.utime(path, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 1_000_000_000))
+
+
+def test_failed_ledger_is_not_retried_until_it_changes(monkeypatch, folders, watcher):
+    watch_dir, _ = folders
+    calls = []
+
+    def failing_process_ledger(path, executor=None):
+        calls.append(path)
+        raise ValueError("broken ledger")
+
+    monkeypatch.setattr(main, 'process_ledger', failing_process_ledger)
+    ledger = watch_dir / "bad.pdf"
+    touch_ledger(ledger, b"%PDF broken")
+
+    for _ in range(5):
+        watcher.poll_once()
+    assert len(calls) == 1
+
+    touch_ledger(ledger, b"%PDF broken, edited")
+    watcher.poll_once()
+    assert len(calls) == 2
+
+
+def test_reprocessed_ledger_replaces_old_output(monkeypatch, folders, watcher):
+    watch_dir, output_root = folders
+    stub_names = [["a_1_급여명세서.pdf", "b_2_급여명세서.pdf"], ["a_1_급여명세서.pdf"]]
+
+    def fake_process_ledger(path, executor=None):
+        names = stub_names.pop(0)
+        return {
+            'payment_date': "2025년5월25일",
+            'paystubs': [(name, b"%PDF") for name in names],
+            'report': f"직원 수: {len(names)}명\n",
+        }
+
+    monkeypatch.setattr(main, 'process_ledger', fake_process_ledger)
+    ledger = watch_dir / "2025-05.pdf"
+    touch_ledger(ledger, b"%PDF v1")
+    watcher.poll_once()
+
+    output_dir = output_root / "2025-05"
+    assert sorted(os.listdir(output_dir)) == ["a_1_급여명세서.pdf", "b_2_급여명세서.pdf", main.VALIDATION_REPORT_NAME]
+
+    touch_ledger(ledger, b"%PDF v2, employee b removed")
+    watcher.poll_once()
+
+    assert sorted(os.listdir(output_dir)) == ["a_1_급여명세서.pdf", main.VALIDATION_REPORT_NAME]
+    assert (output_dir / main.VALIDATION_REPORT_NAME).read_text(encoding='utf-8') == "직원 수: 1명\n"
+    assert sorted(os.listdir(output_root)) == ["2025-05"]
+
+
+def wait_until(condition, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_ledger_revised_during_processing_waits_for_running_job(monkeypatch, folders):
+    watch_dir, output_root = folders
+    watcher = main.LedgerFolderWatcher(str(watch_dir), output_root=str(output_root),
+                                       settle_seconds=0, rescan_interval=0, workers=1, max_ledgers=2)
+    v1_started = threading.Event()
+    release_v1 = threading.Event()
+    processed = []
+
+    def fake_process_ledger(path, executor=None):
+        content = open(path, 'rb').read()
+        processed.append(content)
+        if content == b"%PDF v1":
+            v1_started.set()
+            release_v1.wait(10)
+            names = [f"old_{i}_급여명세서.pdf" for i in range(11)]
+        else:
+            names = ["new_1_급여명세서.pdf"]
+        return {'payment_date': "", 'paystubs': [(name, content) for name in names], 'report': "done\n"}
+
+    monkeypatch.setattr(main, 'process_ledger', fake_process_ledger)
+    ledger = watch_dir / "L.pdf"
+    try:
+        touch_ledger(ledger, b"%PDF v1")
+        watcher.poll_once()
+        assert v1_started.wait(10)
+
+        touch_ledger(ledger, b"%PDF v2")
+        for _ in range(3):
+            watcher.poll_once()
+        assert processed == [b"%PDF v1"]
+
+        release_v1.set()
+        wait_until(lambda: not watcher._in_flight)
+        watcher.poll_once()
+        wait_until(lambda: len(processed) == 2 and not watcher._in_flight)
+    finally:
+        release_v1.set()
+        watcher.close()
+
+    assert processed == [b"%PDF v1", b"%PDF v2"]
+    assert sorted(os.listdir(output_root / "L")) == ["new_1_급여명세서.pdf", main.VALIDATION_REPORT_NAME]
+    assert sorted(os.listdir(output_root)) == ["L"]